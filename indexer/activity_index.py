@@ -0,0 +1,135 @@
+import os
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Tuple
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def generate_activity_index_filepath(
+    base_dir: str,
+    contract_address: str,
+    topic: str,
+    argument_filters: Dict[str, Any]
+) -> str:
+    """Returns the index file for a (contract, event topic, indexed argument values) filter."""
+    filter_key = "__".join(f"{name}_{str(value).lower()}" for name, value in sorted(argument_filters.items()))
+    return os.path.join(base_dir, contract_address.lower(), topic.lower(), f"{filter_key}.json")
+
+
+class ActivityIndex:
+    """
+    Persisted record of which block spans contain at least one matching log for a single filter.
+
+    Blocks are grouped into fixed size spans aligned to multiples of span_size, so records
+    remain reusable across runs with different start blocks or block increments. A span is
+    either active (contains a matching log), empty (confirmed to contain none) or unknown.
+    Records are only valid for the chain they were built on, identified by chain_id.
+    """
+
+    def __init__(self, filepath: str, span_size: int, chain_id: int) -> None:
+        if span_size <= 0:
+            raise ValueError(f"span_size must be positive, got {span_size}")
+        self.filepath = filepath
+        self.span_size = span_size
+        self.chain_id = chain_id
+        self._spans: Dict[int, bool] = {}
+
+    @classmethod
+    def load(cls, filepath: str, span_size: int, chain_id: int) -> "ActivityIndex":
+        """Loads an index from disk, starting fresh if the file is missing or incompatible."""
+        index = cls(filepath, span_size, chain_id)
+        if not os.path.exists(filepath):
+            return index
+
+        try:
+            with open(filepath) as f:
+                data = json.load(f)
+
+            if data.get("chain_id") != chain_id:
+                logging.info(f"Activity index '{filepath}' was built for chain {data.get('chain_id')}, rebuilding for chain {chain_id}")
+                return index
+            if data.get("span_size") != span_size:
+                logging.info(f"Activity index '{filepath}' uses span size {data.get('span_size')}, rebuilding with {span_size}")
+                return index
+
+            # Active runs are applied last so a span listed as both is still fetched
+            spans: Dict[int, bool] = {}
+            for is_active, key in ((False, "empty"), (True, "active")):
+                for first_span, last_span in data.get(key, []):
+                    for span in range(int(first_span), int(last_span) + 1):
+                        spans[span] = is_active
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logging.error(f"Error reading activity index '{filepath}', rebuilding it: {e}")
+            return index
+
+        index._spans = spans
+        logging.info(f"Loaded activity index '{filepath}' with {len(index._spans)} known spans")
+        return index
+
+    def save(self) -> None:
+        """Atomically writes the index to disk as runs of consecutive active and empty spans."""
+        data = {
+            "chain_id": self.chain_id,
+            "span_size": self.span_size,
+            "active": self._runs(True),
+            "empty": self._runs(False),
+        }
+        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+        temp_filepath = f"{self.filepath}.tmp"
+        with open(temp_filepath, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_filepath, self.filepath)
+
+    def _runs(self, is_active: bool) -> List[List[int]]:
+        runs: List[List[int]] = []
+        for span in sorted(s for s, active in self._spans.items() if active == is_active):
+            if runs and runs[-1][1] == span - 1:
+                runs[-1][1] = span
+            else:
+                runs.append([span, span])
+        return runs
+
+    def record_range(self, from_block: int, to_block: int, event_blocks: Iterable[int]) -> None:
+        """
+        Records the result of a log query over [from_block, to_block].
+
+        Spans holding one of event_blocks are marked active. Spans lying entirely inside the
+        range without any event are marked empty; partially covered spans are left untouched.
+        """
+        if from_block > to_block:
+            return
+
+        active_spans = {
+            block // self.span_size
+            for block in event_blocks
+            if from_block <= block <= to_block
+        }
+        for span in active_spans:
+            self._spans[span] = True
+
+        first_full_span = -(-from_block // self.span_size)
+        last_full_span = (to_block + 1) // self.span_size - 1
+        for span in range(first_full_span, last_full_span + 1):
+            if span not in active_spans:
+                self._spans[span] = False
+
+    def ranges_to_fetch(self, from_block: int, to_block: int, max_gap: int = 0) -> List[Tuple[int, int]]:
+        """
+        Splits [from_block, to_block] into the block ranges that still need to be queried,
+        dropping spans confirmed to be empty.
+
+        Ranges separated by at most max_gap empty blocks are merged into one range, since
+        skipping a short gap costs more in extra queries than it saves.
+        """
+        ranges: List[Tuple[int, int]] = []
+        for span in range(from_block // self.span_size, to_block // self.span_size + 1):
+            if self._spans.get(span) is False:
+                continue
+            span_start = max(span * self.span_size, from_block)
+            span_end = min((span + 1) * self.span_size - 1, to_block)
+            if ranges and span_start - ranges[-1][1] - 1 <= max_gap:
+                ranges[-1] = (ranges[-1][0], span_end)
+            else:
+                ranges.append((span_start, span_end))
+        return ranges
@@ -5,7 +5,8 @@ from typing import Type, Optional, List, Dict, Any
 from contract.base_contract import BaseContract
 from contract.staking_info import StakingInfo
 from duckdb_integration import update_duckdb_from_parquet
-from web3_utils import get_web3_connection, get_contract_instance, fetch_events_in_range
+from web3_utils import get_web3_connection, get_contract_instance, fetch_events_in_range, get_event_topic
+from activity_index import ActivityIndex, generate_activity_index_filepath
 from parquet_utils import write_events_to_parquet, generate_parquet_filepath, setup_temporary_directory, atomic_directory_replace
 from validation import validate_data_against_spec
 
@@ -19,6 +20,10 @@ class EventProcessorConfig:
     start_block: int = 0
     block_increment: int = 1000000
     output_dir: str = "contract_events"
+    activity_index_dir: str = "activity_index"
+    activity_span_size: int = 10000  # Granularity of recorded active/empty block spans
+    activity_merge_gap: int = 250000  # Largest empty gap merged into one query rather than skipped
+    finality_depth: int = 256  # Blocks behind head before a span is recorded in the activity index
 
 class EventProcessor:
     """Handles processing of blockchain events."""
@@ -44,6 +49,22 @@ class EventProcessor:
         if unsupported:
             raise ValueError(f"Unsupported events: {unsupported}")
 
+        self.argument_filters = {'user': self.checksum_address}
+        chain_id = self.w3.eth.chain_id
+        self.activity_indexes = {
+            event_name: ActivityIndex.load(
+                generate_activity_index_filepath(
+                    self.config.activity_index_dir,
+                    self.config.contract_address,
+                    get_event_topic(self.contract, event_name),
+                    self.argument_filters
+                ),
+                self.config.activity_span_size,
+                chain_id
+            )
+            for event_name in self.event_names
+        }
+
     def _process_event(self, event_name: str, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Process a single event."""
         try:
@@ -56,8 +77,10 @@ class EventProcessor:
             return None
 
     def _process_block_range(self, start_block: int, temp_dir: str) -> int:
-        """Process events in a block range."""
-        end_block = min(start_block + self.config.block_increment, self.w3.eth.block_number + 1)
+        """Process events in a block range, skipping spans the activity index has confirmed empty."""
+        head_block = self.w3.eth.block_number
+        end_block = min(start_block + self.config.block_increment, head_block + 1)
+        safe_block = head_block - self.config.finality_depth
         if start_block >= end_block:
             return end_block
 
@@ -70,13 +93,32 @@ class EventProcessor:
                 end_block - 1
             )
             
-            events = fetch_events_in_range(
-                self.contract,
-                event_name,
+            activity_index = self.activity_indexes[event_name]
+            fetch_ranges = activity_index.ranges_to_fetch(
                 start_block,
                 end_block - 1,
-                {'user': self.checksum_address}
+                self.config.activity_merge_gap
             )
+            if not fetch_ranges:
+                logging.info(f"Skipping {event_name}: no activity in {start_block}-{end_block - 1}")
+                continue
+
+            events = []
+            for from_block, to_block in fetch_ranges:
+                range_events = fetch_events_in_range(
+                    self.contract,
+                    event_name,
+                    from_block,
+                    to_block,
+                    self.argument_filters
+                )
+                activity_index.record_range(
+                    from_block,
+                    min(to_block, safe_block),
+                    [event['blockNumber'] for event in range_events]
+                )
+                events.extend(range_events)
+            activity_index.save()
             
             processed_events = [
                 processed for event in events 
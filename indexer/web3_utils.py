@@ -39,3 +39,8 @@ def fetch_events_in_range(
     events = event_filter.get_all_entries()
     return events
 
+
+def get_event_topic(contract_instance: Contract, event_name: str) -> str:
+    """Returns the hex encoded log topic (signature hash) of a contract event."""
+    event = getattr(contract_instance.events, event_name)
+    return event.topic
@@ -1,6 +1,10 @@
+import os
 import sys
 from unittest.mock import MagicMock
 
+# Application modules import each other as top-level modules, as when run from indexer/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "indexer"))
+
 mock_env = MagicMock()
 mock_env.PROVIDER_URL = "http://localhost:8545" 
-sys.modules['environment'] = mock_env 
\ No newline at end of file
+sys.modules['environment'] = mock_env 
@@ -0,0 +1,116 @@
+import os
+import json
+import pytest
+
+from indexer.activity_index import ActivityIndex, generate_activity_index_filepath
+
+@pytest.fixture
+def index_filepath(tmp_path):
+    return str(tmp_path / "activity_index" / "index.json")
+
+def open_index(filepath):
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    return open(filepath, "w")
+
+def test_generate_activity_index_filepath():
+    """Test index filepath is keyed by contract, topic and argument values."""
+    filepath = generate_activity_index_filepath(
+        "activity_index",
+        "0xABCD",
+        "0xTOPIC",
+        {"user": "0xUSER"}
+    )
+    assert filepath == "activity_index/0xabcd/0xtopic/user_0xuser.json"
+
+def test_invalid_span_size(index_filepath):
+    """Test index rejects non positive span sizes."""
+    with pytest.raises(ValueError, match="span_size must be positive"):
+        ActivityIndex(index_filepath, 0, 137)
+
+def test_unknown_ranges_are_fetched(index_filepath):
+    """Test an empty index fetches the whole range in one query."""
+    index = ActivityIndex(index_filepath, 100, 137)
+    assert index.ranges_to_fetch(50, 549) == [(50, 549)]
+
+def test_record_range_skips_empty_spans(index_filepath):
+    """Test empty spans are skipped while active spans are still fetched."""
+    index = ActivityIndex(index_filepath, 100, 137)
+    index.record_range(0, 499, [150, 420])
+    assert index.ranges_to_fetch(0, 499) == [(100, 199), (400, 499)]
+
+def test_record_range_ignores_partial_spans(index_filepath):
+    """Test spans only partially covered by a query are not marked empty."""
+    index = ActivityIndex(index_filepath, 100, 137)
+    index.record_range(50, 349, [])
+    assert index.ranges_to_fetch(0, 399) == [(0, 99), (300, 399)]
+
+def test_record_range_noop_when_range_inverted(index_filepath):
+    """Test nothing is recorded when the range lies beyond the finalized block."""
+    index = ActivityIndex(index_filepath, 100, 137)
+    index.record_range(200, 199, [])
+    assert index.ranges_to_fetch(0, 299) == [(0, 299)]
+
+def test_save_and_load_roundtrip(index_filepath):
+    """Test the index persists as span runs and loads back."""
+    index = ActivityIndex(index_filepath, 100, 137)
+    index.record_range(0, 599, [250])
+    index.save()
+
+    with open(index_filepath) as f:
+        assert json.load(f) == {"chain_id": 137, "span_size": 100, "active": [[2, 2]], "empty": [[0, 1], [3, 5]]}
+
+    loaded = ActivityIndex.load(index_filepath, 100, 137)
+    assert loaded.ranges_to_fetch(0, 699) == [(200, 299), (600, 699)]
+
+def test_load_discards_mismatched_span_size(index_filepath):
+    """Test an index written with another span size is rebuilt."""
+    index = ActivityIndex(index_filepath, 100, 137)
+    index.record_range(0, 599, [])
+    index.save()
+
+    loaded = ActivityIndex.load(index_filepath, 1000, 137)
+    assert loaded.ranges_to_fetch(0, 599) == [(0, 599)]
+
+def test_load_missing_file(index_filepath):
+    """Test loading a missing index starts empty."""
+    index = ActivityIndex.load(index_filepath, 100, 137)
+    assert index.ranges_to_fetch(0, 99) == [(0, 99)]
+
+def test_ranges_to_fetch_merges_short_gaps(index_filepath):
+    """Test scattered active spans are merged into one query instead of one per span."""
+    index = ActivityIndex(index_filepath, 100, 137)
+    index.record_range(0, 999, [block for block in range(50, 1000, 200)])
+    assert len(index.ranges_to_fetch(0, 999)) == 5
+    assert index.ranges_to_fetch(0, 999, max_gap=100) == [(0, 899)]
+
+def test_ranges_to_fetch_splits_long_gaps(index_filepath):
+    """Test empty gaps longer than max_gap are still skipped."""
+    index = ActivityIndex(index_filepath, 100, 137)
+    index.record_range(0, 999, [50, 950])
+    assert index.ranges_to_fetch(0, 999, max_gap=300) == [(0, 99), (900, 999)]
+
+def test_load_prefers_active_over_empty(index_filepath):
+    """Test a span listed as both active and empty is loaded as active."""
+    with open_index(index_filepath) as f:
+        json.dump({"chain_id": 137, "span_size": 100, "active": [[1, 1]], "empty": [[0, 2]]}, f)
+
+    loaded = ActivityIndex.load(index_filepath, 100, 137)
+    assert loaded.ranges_to_fetch(0, 299) == [(100, 199)]
+
+@pytest.mark.parametrize("content", ["[]", '{"chain_id": 137, "span_size": 100, "empty": [[0]]}', "not json"])
+def test_load_rebuilds_malformed_index(index_filepath, content):
+    """Test a malformed index file is rebuilt instead of raising."""
+    with open_index(index_filepath) as f:
+        f.write(content)
+
+    loaded = ActivityIndex.load(index_filepath, 100, 137)
+    assert loaded.ranges_to_fetch(0, 99) == [(0, 99)]
+
+def test_load_discards_other_chain(index_filepath):
+    """Test an index built on another chain is rebuilt."""
+    index = ActivityIndex(index_filepath, 100, 1)
+    index.record_range(0, 599, [])
+    index.save()
+
+    loaded = ActivityIndex.load(index_filepath, 100, 137)
+    assert loaded.ranges_to_fetch(0, 599) == [(0, 599)]
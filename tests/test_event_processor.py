@@ -0,0 +1,106 @@
+import pytest
+from unittest.mock import Mock, patch
+from web3 import Web3
+
+from indexer.event_processor import EventProcessor, EventProcessorConfig
+from contract.staking_info import StakingInfo
+
+TARGET_ADDRESS = "0x1234567890123456789012345678901234567890"
+EVENT_NAME = StakingInfo.DELEGATOR_CLAIMED_REWARDS
+
+@pytest.fixture
+def mock_w3():
+    """Fixture for mocked Web3 connection."""
+    w3 = Mock()
+    w3.to_checksum_address = Web3.to_checksum_address
+    w3.eth.block_number = 1000000
+    w3.eth.chain_id = 137
+    with patch('indexer.event_processor.get_web3_connection', return_value=w3), \
+         patch('indexer.event_processor.get_contract_instance', return_value=Mock()), \
+         patch('indexer.event_processor.get_event_topic', return_value="0xtopic"), \
+         patch('contract.staking_info.get_web3_connection', return_value=Web3()):
+        yield w3
+
+def make_event(block_number):
+    return {
+        "args": {
+            "validatorId": 1,
+            "user": Web3.to_checksum_address(TARGET_ADDRESS),
+            "rewards": 10 ** 18
+        },
+        "blockNumber": block_number,
+        "transactionHash": bytes(32)
+    }
+
+@pytest.fixture
+def mock_fetch():
+    """Fixture returning events at the given blocks for whichever range is queried."""
+    event_blocks = []
+
+    def fetch(contract, event_name, from_block, to_block, argument_filters):
+        return [make_event(block) for block in event_blocks if from_block <= block <= to_block]
+
+    with patch('indexer.event_processor.fetch_events_in_range', side_effect=fetch) as mock:
+        yield mock, event_blocks
+
+def make_processor(tmp_path, **kwargs):
+    options = {
+        "block_increment": 1000,
+        "output_dir": str(tmp_path / "contract_events"),
+        "activity_index_dir": str(tmp_path / "activity_index"),
+        "activity_span_size": 100,
+        "finality_depth": 0,
+        **kwargs
+    }
+    config = EventProcessorConfig(
+        target_address=TARGET_ADDRESS,
+        contract_address=StakingInfo.CONTRACT_ADDRESS,
+        **options
+    )
+    return EventProcessor(config)
+
+def fetched_ranges(mock):
+    return [(call.args[2], call.args[3]) for call in mock.call_args_list]
+
+def test_known_empty_window_is_not_queried(tmp_path, mock_w3, mock_fetch):
+    """Test a window the activity index marks empty produces no query."""
+    mock, _ = mock_fetch
+    processor = make_processor(tmp_path)
+    processor.activity_indexes[EVENT_NAME].record_range(0, 999, [])
+
+    assert processor._process_block_range(0, str(tmp_path / "temp")) == 1000
+    mock.assert_not_called()
+
+def test_spans_within_finality_depth_are_not_recorded(tmp_path, mock_w3, mock_fetch):
+    """Test spans within finality_depth of head are never marked empty."""
+    mock, _ = mock_fetch
+    mock_w3.eth.block_number = 1000
+    processor = make_processor(tmp_path, finality_depth=300)
+
+    processor._process_block_range(0, str(tmp_path / "temp"))
+    processor._process_block_range(0, str(tmp_path / "temp"))
+
+    assert fetched_ranges(mock) == [(0, 999), (700, 999)]
+
+def test_repeat_run_only_queries_active_spans(tmp_path, mock_w3, mock_fetch):
+    """Test a second run, with the index reloaded from disk, only queries active spans."""
+    mock, event_blocks = mock_fetch
+    event_blocks.extend([150, 750])
+
+    make_processor(tmp_path, activity_merge_gap=0)._process_block_range(0, str(tmp_path / "temp"))
+    assert fetched_ranges(mock) == [(0, 999)]
+
+    mock.reset_mock()
+    make_processor(tmp_path, activity_merge_gap=0)._process_block_range(0, str(tmp_path / "temp"))
+    assert fetched_ranges(mock) == [(100, 199), (700, 799)]
+
+def test_scattered_activity_is_fetched_in_one_query(tmp_path, mock_w3, mock_fetch):
+    """Test active spans scattered across a window do not fan out into one query per span."""
+    mock, event_blocks = mock_fetch
+    event_blocks.extend(range(50, 1000, 200))
+
+    make_processor(tmp_path)._process_block_range(0, str(tmp_path / "temp"))
+    mock.reset_mock()
+    make_processor(tmp_path)._process_block_range(0, str(tmp_path / "temp"))
+
+    assert fetched_ranges(mock) == [(0, 899)]
@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import Mock, patch
 from web3 import Web3
 
-from indexer.web3_utils import get_web3_connection, get_contract_instance, fetch_events_in_range
+from indexer.web3_utils import get_web3_connection, get_contract_instance, fetch_events_in_range, get_event_topic
 
 @pytest.fixture(autouse=True)
 def mock_environment():
@@ -86,4 +86,20 @@ def test_fetch_events_in_range(mock_contract):
         from_block=from_block,
         to_block=to_block,
         argument_filters=None
-    ) 
\ No newline at end of file
+    )
+
+def test_get_event_topic():
+    """Test event topic is the keccak hash of the event signature."""
+    contract_abi = [{
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "from", "type": "address"},
+            {"indexed": True, "name": "to", "type": "address"},
+            {"indexed": False, "name": "value", "type": "uint256"}
+        ],
+        "name": "Transfer",
+        "type": "event"
+    }]
+    contract = Web3().eth.contract(address="0x1234567890123456789012345678901234567890", abi=contract_abi)
+
+    assert get_event_topic(contract, "Transfer") == "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"